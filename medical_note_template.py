@@ -3,36 +3,216 @@ Medical Note Template System
 A modifiable template system for generating various types of medical notes.
 """
 
-from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Any, TextIO, Tuple
 
+# Placeholder shown for required fields that have not been filled in
+NOT_PROVIDED = '[NOT PROVIDED]'
 
-class MedicalNoteTemplate(ABC):
+# strftime format of the date/time stamped on formatted notes
+_SIG_FMT = '%Y-%m-%d %H:%M'
+
+# Rules and banners shared by the note layouts
+_EQ_BAR = "=" * 80 + "\n"
+_DASH_BAR = "-" * 80 + "\n"
+_CONSULT_BANNER = _EQ_BAR + "CONSULTATION NOTE\n" + _EQ_BAR + "\n"
+_HANDOFF_BANNER = _EQ_BAR + "HANDOFF NOTE\n" + _EQ_BAR + "\n"
+_OPERATIVE_BANNER = _EQ_BAR + "OPERATIVE REPORT\n" + _EQ_BAR + "\n"
+
+
+class SpecKind(Enum):
+    """Kinds of entry in a template's FORMAT_SPEC."""
+    TEXT = 'text'                            # label is emitted verbatim
+    TIMESTAMP = 'timestamp'                  # "label: <current date/time>" line
+    LINE = 'line'                            # "label: value", NOT_PROVIDED if missing
+    OPT_LINE = 'opt_line'                    # "label: value", only if the field is set
+    SECTION = 'section'                      # titled section, NOT_PROVIDED if missing
+    OPT_SECTION = 'opt_section'              # titled section, only if the field is set
+    LIST_SECTION = 'list_section'            # SECTION, bulleted if the value is a list
+    OPT_LIST_SECTION = 'opt_list_section'    # OPT_SECTION, bulleted if the value is a list
+
+
+# A note layout: (label, field_name, kind) entries rendered in order
+FormatSpec = Tuple[Tuple[str, Optional[str], SpecKind], ...]
+
+# A compiled layout, called as formatter(template, write, now): it passes each
+# note fragment to write and prints `now` in any timestamp line
+_Formatter = Callable[['MedicalNoteTemplate', Callable[[str], Any], str], None]
+
+
+def _escape_braces(text: str) -> str:
+    """Escape text for use as literal f-string content."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _line_template(label: str, value_name: str) -> str:
+    """Return f-string content rendering 'label: {value_name}\\n'."""
+    return f"{_escape_braces(label)}: {{{value_name}}}\n"
+
+
+def _section_source(label: str) -> List[str]:
+    """Return source writing the section for the value bound to `v`."""
+    return [f"write(self._format_section({label!r}, v))"]
+
+
+def _list_or_section_source(label: str) -> List[str]:
+    """Return source writing `v` as a bulleted section if it is a list, else as a section."""
+    return [
+        "if isinstance(v, list):",
+        f"    write(self._format_list_section({label!r}, v))",
+        "else:",
+        f"    write(self._format_section({label!r}, v))"
+    ]
+
+
+def _required(field: str, body: List[str]) -> List[str]:
+    """Bind field `field` (defaulting to NOT_PROVIDED) to `v` and run `body`."""
+    return [f"v = get({field!r}, {NOT_PROVIDED!r})"] + body
+
+
+def _optional(field: str, body: List[str]) -> List[str]:
+    """Bind field `field` to `v` and run `body` only if the value is set."""
+    return [f"v = get({field!r})", "if v:"] + ["    " + line for line in body]
+
+
+# Source emitters for the section kinds: (label, field) -> lines of Python source
+_SECTION_EMITTERS: Dict[SpecKind, Callable[[str, str], List[str]]] = {
+    SpecKind.SECTION: lambda label, field: _required(field, _section_source(label)),
+    SpecKind.OPT_SECTION: lambda label, field: _optional(field, _section_source(label)),
+    SpecKind.LIST_SECTION: lambda label, field: _required(field, _list_or_section_source(label)),
+    SpecKind.OPT_LIST_SECTION: lambda label, field: _optional(field, _list_or_section_source(label)),
+}
+
+# Source for the single-line kinds: (label, field, value_name) -> (statements
+# binding value_name, f-string content rendering the line, name of the value
+# the line is conditional on or None if it is always written)
+_LINE_PIECES: Dict[SpecKind, Callable[[str, Optional[str], str], Tuple[List[str], str, Optional[str]]]] = {
+    SpecKind.TEXT: lambda label, field, name: ([], _escape_braces(label), None),
+    SpecKind.TIMESTAMP: lambda label, field, name: ([], _line_template(label, 'now'), None),
+    SpecKind.LINE: lambda label, field, name: (
+        [f"{name} = get({field!r}, {NOT_PROVIDED!r})"], _line_template(label, name), None),
+    SpecKind.OPT_LINE: lambda label, field, name: (
+        [f"{name} = get({field!r})"], _line_template(label, name), name),
+}
+
+
+def _line_block_source(entries: List[Tuple[str, Optional[str], SpecKind]]) -> List[str]:
+    """
+    Return source writing a run of single-line spec entries with one write call.
+    Adjacent unconditional entries are merged into a single f-string, so e.g. a
+    banner followed by the required demographics lines renders as one template.
+    """
+    lines = []
+    pieces = []
+    template = ""
+    for i, (label, field, kind) in enumerate(entries):
+        bindings, line, condition = _LINE_PIECES[kind](label, field, f"v{i}")
+        lines.extend(bindings)
+        if condition is None:
+            template += line
+            continue
+        if template:
+            pieces.append("f" + repr(template))
+            template = ""
+        pieces.append(f"({'f' + repr(line)} if {condition} else '')")
+    if template:
+        pieces.append("f" + repr(template))
+
+    if len(pieces) == 1:
+        lines.append(f"write({pieces[0]})")
+    else:
+        lines.append(f"write(''.join(({', '.join(pieces)})))")
+    return lines
+
+
+class MedicalNoteTemplate:
     """
     Base class for all medical note templates.
     Provides common functionality for creating, editing, and formatting medical notes.
+    Subclasses declare their field names in REQUIRED_FIELDS and OPTIONAL_FIELDS
+    tuples, and either a FORMAT_SPEC layout or their own format_note().
+    The base class itself is not instantiable; create one of its subclasses.
     """
 
-    def __init__(self):
-        self.fields: Dict[str, Any] = {}
-        self.created_date = datetime.now()
-        self.last_modified = datetime.now()
+    __slots__ = ('fields', 'created_date', 'last_modified',
+                 '_cached_note', '_cached_mtime', '_cached_stamp', '__weakref__')
 
-    @abstractmethod
-    def get_required_fields(self) -> List[str]:
-        """Return list of required field names for this template."""
-        pass
+    # FORMAT_SPEC compiled by __init_subclass__, or None for templates that
+    # override format_note() instead
+    _formatter: Optional[_Formatter] = None
 
-    @abstractmethod
-    def get_optional_fields(self) -> List[str]:
-        """Return list of optional field names for this template."""
-        pass
+    def __init__(self):
+        if type(self) is MedicalNoteTemplate:
+            raise TypeError("MedicalNoteTemplate is not instantiable; use one of its subclasses")
+        self.fields: Dict[str, Any] = {}
+        now = datetime.now()
+        self.created_date = now
+        self.last_modified = now
+        # Last formatted note, plus the last_modified value and timestamp
+        # minute it was built from
+        self._cached_note: Optional[str] = None
+        self._cached_mtime: Optional[datetime] = None
+        self._cached_stamp: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [name for name in ('REQUIRED_FIELDS', 'OPTIONAL_FIELDS') if not hasattr(cls, name)]
+        if missing:
+            raise TypeError(f"{cls.__name__} must define {' and '.join(missing)}")
+        # Compile the layout once, when the class is defined; subclasses that
+        # inherit FORMAT_SPEC unchanged share their parent's formatter
+        if 'FORMAT_SPEC' in cls.__dict__:
+            cls._formatter = staticmethod(cls._build_formatter())
+        if cls._formatter is None and cls.format_note is MedicalNoteTemplate.format_note:
+            raise TypeError(f"{cls.__name__} must define FORMAT_SPEC or override format_note()")
+
+    def get_required_fields(self) -> Tuple[str, ...]:
+        """Return the required field names for this template."""
+        return self.REQUIRED_FIELDS
+
+    def get_optional_fields(self) -> Tuple[str, ...]:
+        """Return the optional field names for this template."""
+        return self.OPTIONAL_FIELDS
 
-    @abstractmethod
     def format_note(self) -> str:
-        """Format and return the complete medical note."""
-        pass
+        """
+        Format and return the complete medical note.
+        Templates either declare a FORMAT_SPEC layout or override this method.
+        """
+        # Read both before formatting, so a field changed meanwhile leaves the
+        # note cached under the old last_modified and it is rebuilt next time
+        mtime = self.last_modified
+        stamp = self._current_stamp()
+        cached = self._get_cached_note(stamp)
+        if cached is not None:
+            return cached
+
+        parts: List[str] = []
+        self._get_formatter()(self, parts.append, stamp)
+        note = "".join(parts)
+        self._cache_note(note, mtime, stamp)
+        return note
+
+    def write_to(self, fp: TextIO) -> None:
+        """
+        Write the formatted note to a text file object.
+        Fragments are streamed to fp.write as they are produced, without first
+        building the whole note as one string.
+        """
+        if type(self).format_note is not MedicalNoteTemplate.format_note:
+            # A subclass overriding format_note() may extend the spec-driven
+            # note, whose cache and compiled formatter it still inherits, so
+            # neither is used on its behalf
+            fp.write(self.format_note())
+            return
+
+        stamp = self._current_stamp()
+        cached = self._get_cached_note(stamp)
+        if cached is not None:
+            fp.write(cached)
+        else:
+            self._get_formatter()(self, fp.write, stamp)
 
     def set_field(self, field_name: str, value: Any) -> None:
         """Set a field value in the template."""
@@ -53,30 +233,98 @@ class MedicalNoteTemplate(ABC):
         Validate that all required fields are filled.
         Returns (is_valid, list_of_missing_fields)
         """
-        missing_fields = []
-        for field in self.get_required_fields():
-            if field not in self.fields or not self.fields[field]:
-                missing_fields.append(field)
-        return (len(missing_fields) == 0, missing_fields)
+        get = self.fields.get
+        missing_fields = [field for field in self.get_required_fields() if not get(field)]
+        return (not missing_fields, missing_fields)
 
     def clear(self) -> None:
         """Clear all field values."""
         self.fields = {}
         self.last_modified = datetime.now()
 
-    def export_to_dict(self) -> Dict[str, Any]:
-        """Export the note as a dictionary."""
+    def export_to_dict(self, copy: bool = True) -> Dict[str, Any]:
+        """
+        Export the note as a dictionary.
+        With copy=False the 'fields' entry is the template's own field dict rather
+        than a copy; use it for read-only consumers such as serializers. Writes
+        through it bypass the note cache, so format_note() would keep returning
+        the note built before them.
+        """
         return {
             'template_type': self.__class__.__name__,
             'created_date': self.created_date.isoformat(),
             'last_modified': self.last_modified.isoformat(),
-            'fields': self.fields.copy()
+            'fields': self.fields.copy() if copy else self.fields
         }
 
+    def _current_stamp(self) -> str:
+        """Return the date/time a note formatted now would print."""
+        return datetime.now().strftime(_SIG_FMT)
+
+    def _get_cached_note(self, stamp: str) -> Optional[str]:
+        """
+        Return the cached formatted note if no field has changed since it was built
+        and its printed date/time is still current.
+        """
+        # Every mutation stores a new datetime object in last_modified, so an
+        # identity check catches changes made within the same clock tick.
+        if self._cached_mtime is self.last_modified and self._cached_stamp == stamp:
+            return self._cached_note
+        return None
+
+    def _cache_note(self, note: str, mtime: datetime, stamp: str) -> None:
+        """Remember a formatted note along with the field state and timestamp it was built from."""
+        self._cached_note = note
+        self._cached_mtime = mtime
+        self._cached_stamp = stamp
+
+    @classmethod
+    def _get_formatter(cls) -> _Formatter:
+        """Return the compiled FORMAT_SPEC formatter for this class."""
+        if cls._formatter is None:
+            raise NotImplementedError(
+                f"{cls.__name__} must define FORMAT_SPEC or override format_note()")
+        return cls._formatter
+
+    @classmethod
+    def _build_formatter(cls) -> _Formatter:
+        """
+        Compile the class FORMAT_SPEC into a function passing each note fragment,
+        in order, to a `write` callable, with `now` as the printed date/time.
+        Every spec entry is unrolled into straight-line code that reads each field
+        once through a local binding of self.fields.get, so formatting a note runs
+        no per-entry dispatch.
+        """
+        lines = ["def _formatter(self, write, now):", "    get = self.fields.get"]
+
+        # Consecutive single-line entries (such as a demographics header) are
+        # rendered together and written with one call
+        block: List[Tuple[str, Optional[str], SpecKind]] = []
+        for label, field, kind in cls.FORMAT_SPEC:
+            if kind in _LINE_PIECES:
+                block.append((label, field, kind))
+                continue
+            if block:
+                lines.extend("    " + line for line in _line_block_source(block))
+                block = []
+            emitter = _SECTION_EMITTERS.get(kind)
+            if emitter is None:
+                raise ValueError(f"Unknown format spec kind {kind!r} in {cls.__name__}")
+            lines.extend("    " + line for line in emitter(label, field))
+        if block:
+            lines.extend("    " + line for line in _line_block_source(block))
+
+        namespace: Dict[str, Any] = {}
+        code = compile("\n".join(lines), f"<{cls.__name__} formatter>", "exec")
+        exec(code, {}, namespace)
+        return namespace['_formatter']
+
     def _format_section(self, title: str, content: str, indent: int = 0) -> str:
         """Helper method to format a section with title and content."""
         if not content:
             return ""
+        if not indent:
+            return f"{title}:\n{content}\n\n"
         indent_str = " " * indent
         return f"{indent_str}{title}:\n{indent_str}{content}\n\n"
 
@@ -84,6 +332,8 @@ class MedicalNoteTemplate(ABC):
         """Helper method to format a section with a list of items."""
         if not items:
             return ""
+        if not indent:
+            return f"{title}:\n- " + "\n- ".join(map(format, items)) + "\n\n"
         indent_str = " " * indent
         formatted_items = "\n".join([f"{indent_str}- {item}" for item in items])
         return f"{indent_str}{title}:\n{formatted_items}\n\n"
@@ -95,169 +345,83 @@ class ConsultNoteTemplate(MedicalNoteTemplate):
     Used when a specialist provides consultation on a patient.
     """
 
-    def get_required_fields(self) -> List[str]:
-        return [
-            'patient_name',
-            'patient_mrn',
-            'date_of_consult',
-            'consulting_service',
-            'reason_for_consult',
-            'history_of_present_illness',
-            'assessment',
-            'recommendations'
-        ]
-
-    def get_optional_fields(self) -> List[str]:
-        return [
-            'patient_dob',
-            'age',
-            'sex',
-            'referring_provider',
-            'past_medical_history',
-            'past_surgical_history',
-            'medications',
-            'allergies',
-            'social_history',
-            'family_history',
-            'review_of_systems',
-            'physical_exam',
-            'labs',
-            'imaging',
-            'other_studies',
-            'differential_diagnosis',
-            'plan',
-            'follow_up',
-            'attending_physician',
-            'consulting_physician'
-        ]
-
-    def format_note(self) -> str:
-        """Format the consult note."""
-        note = "=" * 80 + "\n"
-        note += "CONSULTATION NOTE\n"
-        note += "=" * 80 + "\n\n"
+    __slots__ = ()
+
+    REQUIRED_FIELDS: Tuple[str, ...] = (
+        'patient_name',
+        'patient_mrn',
+        'date_of_consult',
+        'consulting_service',
+        'reason_for_consult',
+        'history_of_present_illness',
+        'assessment',
+        'recommendations'
+    )
+
+    OPTIONAL_FIELDS: Tuple[str, ...] = (
+        'patient_dob',
+        'age',
+        'sex',
+        'referring_provider',
+        'past_medical_history',
+        'past_surgical_history',
+        'medications',
+        'allergies',
+        'social_history',
+        'family_history',
+        'review_of_systems',
+        'physical_exam',
+        'labs',
+        'imaging',
+        'other_studies',
+        'differential_diagnosis',
+        'plan',
+        'follow_up',
+        'attending_physician',
+        'consulting_physician'
+    )
+
+    # Layout of the note: (label, field, kind) entries rendered in order
+    FORMAT_SPEC: FormatSpec = (
+        (_CONSULT_BANNER, None, SpecKind.TEXT),
 
         # Patient Demographics
-        note += "PATIENT INFORMATION:\n"
-        note += f"Name: {self.get_field('patient_name', '[NOT PROVIDED]')}\n"
-        note += f"MRN: {self.get_field('patient_mrn', '[NOT PROVIDED]')}\n"
-        if self.get_field('patient_dob'):
-            note += f"DOB: {self.get_field('patient_dob')}\n"
-        if self.get_field('age'):
-            note += f"Age: {self.get_field('age')}\n"
-        if self.get_field('sex'):
-            note += f"Sex: {self.get_field('sex')}\n"
-        note += f"Date of Consult: {self.get_field('date_of_consult', '[NOT PROVIDED]')}\n"
-        note += f"Consulting Service: {self.get_field('consulting_service', '[NOT PROVIDED]')}\n"
-        if self.get_field('referring_provider'):
-            note += f"Referring Provider: {self.get_field('referring_provider')}\n"
-        note += "\n"
-
-        # Reason for Consult
-        note += self._format_section("REASON FOR CONSULT",
-                                     self.get_field('reason_for_consult', '[NOT PROVIDED]'))
-
-        # History of Present Illness
-        note += self._format_section("HISTORY OF PRESENT ILLNESS",
-                                     self.get_field('history_of_present_illness', '[NOT PROVIDED]'))
-
-        # Past Medical History
-        if self.get_field('past_medical_history'):
-            note += self._format_section("PAST MEDICAL HISTORY",
-                                        self.get_field('past_medical_history'))
-
-        # Past Surgical History
-        if self.get_field('past_surgical_history'):
-            note += self._format_section("PAST SURGICAL HISTORY",
-                                        self.get_field('past_surgical_history'))
-
-        # Medications
-        if self.get_field('medications'):
-            if isinstance(self.get_field('medications'), list):
-                note += self._format_list_section("MEDICATIONS",
-                                                  self.get_field('medications'))
-            else:
-                note += self._format_section("MEDICATIONS",
-                                            self.get_field('medications'))
-
-        # Allergies
-        if self.get_field('allergies'):
-            note += self._format_section("ALLERGIES", self.get_field('allergies'))
-
-        # Social History
-        if self.get_field('social_history'):
-            note += self._format_section("SOCIAL HISTORY",
-                                        self.get_field('social_history'))
-
-        # Family History
-        if self.get_field('family_history'):
-            note += self._format_section("FAMILY HISTORY",
-                                        self.get_field('family_history'))
-
-        # Review of Systems
-        if self.get_field('review_of_systems'):
-            note += self._format_section("REVIEW OF SYSTEMS",
-                                        self.get_field('review_of_systems'))
-
-        # Physical Exam
-        if self.get_field('physical_exam'):
-            note += self._format_section("PHYSICAL EXAMINATION",
-                                        self.get_field('physical_exam'))
-
-        # Labs
-        if self.get_field('labs'):
-            note += self._format_section("LABORATORY DATA", self.get_field('labs'))
-
-        # Imaging
-        if self.get_field('imaging'):
-            note += self._format_section("IMAGING", self.get_field('imaging'))
-
-        # Other Studies
-        if self.get_field('other_studies'):
-            note += self._format_section("OTHER STUDIES",
-                                        self.get_field('other_studies'))
-
-        # Assessment
-        note += self._format_section("ASSESSMENT",
-                                     self.get_field('assessment', '[NOT PROVIDED]'))
-
-        # Differential Diagnosis
-        if self.get_field('differential_diagnosis'):
-            if isinstance(self.get_field('differential_diagnosis'), list):
-                note += self._format_list_section("DIFFERENTIAL DIAGNOSIS",
-                                                  self.get_field('differential_diagnosis'))
-            else:
-                note += self._format_section("DIFFERENTIAL DIAGNOSIS",
-                                            self.get_field('differential_diagnosis'))
-
-        # Recommendations
-        if isinstance(self.get_field('recommendations'), list):
-            note += self._format_list_section("RECOMMENDATIONS",
-                                             self.get_field('recommendations', ['[NOT PROVIDED]']))
-        else:
-            note += self._format_section("RECOMMENDATIONS",
-                                        self.get_field('recommendations', '[NOT PROVIDED]'))
-
-        # Plan
-        if self.get_field('plan'):
-            if isinstance(self.get_field('plan'), list):
-                note += self._format_list_section("PLAN", self.get_field('plan'))
-            else:
-                note += self._format_section("PLAN", self.get_field('plan'))
-
-        # Follow-up
-        if self.get_field('follow_up'):
-            note += self._format_section("FOLLOW-UP", self.get_field('follow_up'))
+        ("PATIENT INFORMATION:\n", None, SpecKind.TEXT),
+        ("Name", 'patient_name', SpecKind.LINE),
+        ("MRN", 'patient_mrn', SpecKind.LINE),
+        ("DOB", 'patient_dob', SpecKind.OPT_LINE),
+        ("Age", 'age', SpecKind.OPT_LINE),
+        ("Sex", 'sex', SpecKind.OPT_LINE),
+        ("Date of Consult", 'date_of_consult', SpecKind.LINE),
+        ("Consulting Service", 'consulting_service', SpecKind.LINE),
+        ("Referring Provider", 'referring_provider', SpecKind.OPT_LINE),
+        ("\n", None, SpecKind.TEXT),
+
+        ("REASON FOR CONSULT", 'reason_for_consult', SpecKind.SECTION),
+        ("HISTORY OF PRESENT ILLNESS", 'history_of_present_illness', SpecKind.SECTION),
+        ("PAST MEDICAL HISTORY", 'past_medical_history', SpecKind.OPT_SECTION),
+        ("PAST SURGICAL HISTORY", 'past_surgical_history', SpecKind.OPT_SECTION),
+        ("MEDICATIONS", 'medications', SpecKind.OPT_LIST_SECTION),
+        ("ALLERGIES", 'allergies', SpecKind.OPT_SECTION),
+        ("SOCIAL HISTORY", 'social_history', SpecKind.OPT_SECTION),
+        ("FAMILY HISTORY", 'family_history', SpecKind.OPT_SECTION),
+        ("REVIEW OF SYSTEMS", 'review_of_systems', SpecKind.OPT_SECTION),
+        ("PHYSICAL EXAMINATION", 'physical_exam', SpecKind.OPT_SECTION),
+        ("LABORATORY DATA", 'labs', SpecKind.OPT_SECTION),
+        ("IMAGING", 'imaging', SpecKind.OPT_SECTION),
+        ("OTHER STUDIES", 'other_studies', SpecKind.OPT_SECTION),
+        ("ASSESSMENT", 'assessment', SpecKind.SECTION),
+        ("DIFFERENTIAL DIAGNOSIS", 'differential_diagnosis', SpecKind.OPT_LIST_SECTION),
+        ("RECOMMENDATIONS", 'recommendations', SpecKind.LIST_SECTION),
+        ("PLAN", 'plan', SpecKind.OPT_LIST_SECTION),
+        ("FOLLOW-UP", 'follow_up', SpecKind.OPT_SECTION),
 
         # Signature
-        note += "\n" + "-" * 80 + "\n"
-        if self.get_field('consulting_physician'):
-            note += f"Consulting Physician: {self.get_field('consulting_physician')}\n"
-        if self.get_field('attending_physician'):
-            note += f"Attending Physician: {self.get_field('attending_physician')}\n"
-        note += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-
-        return note
+        ("\n" + _DASH_BAR, None, SpecKind.TEXT),
+        ("Consulting Physician", 'consulting_physician', SpecKind.OPT_LINE),
+        ("Attending Physician", 'attending_physician', SpecKind.OPT_LINE),
+        ("Date", None, SpecKind.TIMESTAMP)
+    )
 
 
 class EpicHandoffTemplate(MedicalNoteTemplate):
@@ -266,191 +430,87 @@ class EpicHandoffTemplate(MedicalNoteTemplate):
     Used for patient handoffs between shifts or providers.
     """
 
-    def get_required_fields(self) -> List[str]:
-        return [
-            'patient_name',
-            'patient_mrn',
-            'patient_location',
-            'primary_diagnosis',
-            'active_issues'
-        ]
-
-    def get_optional_fields(self) -> List[str]:
-        return [
-            'age',
-            'sex',
-            'admission_date',
-            'hospital_day',
-            'brief_history',
-            'past_medical_history',
-            'code_status',
-            'allergies',
-            'vital_signs',
-            'key_labs',
-            'key_imaging',
-            'current_medications',
-            'iv_fluids',
-            'diet',
-            'activity',
-            'lines_tubes_drains',
-            'pending_studies',
-            'pending_consults',
-            'to_do_list',
-            'if_then_scenarios',
-            'anticipated_discharge_date',
-            'discharge_planning',
-            'family_communication',
-            'handoff_from',
-            'handoff_to'
-        ]
-
-    def format_note(self) -> str:
-        """Format the Epic handoff note."""
-        note = "=" * 80 + "\n"
-        note += "HANDOFF NOTE\n"
-        note += "=" * 80 + "\n\n"
+    __slots__ = ()
+
+    REQUIRED_FIELDS: Tuple[str, ...] = (
+        'patient_name',
+        'patient_mrn',
+        'patient_location',
+        'primary_diagnosis',
+        'active_issues'
+    )
+
+    OPTIONAL_FIELDS: Tuple[str, ...] = (
+        'age',
+        'sex',
+        'admission_date',
+        'hospital_day',
+        'brief_history',
+        'past_medical_history',
+        'code_status',
+        'allergies',
+        'vital_signs',
+        'key_labs',
+        'key_imaging',
+        'current_medications',
+        'iv_fluids',
+        'diet',
+        'activity',
+        'lines_tubes_drains',
+        'pending_studies',
+        'pending_consults',
+        'to_do_list',
+        'if_then_scenarios',
+        'anticipated_discharge_date',
+        'discharge_planning',
+        'family_communication',
+        'handoff_from',
+        'handoff_to'
+    )
+
+    # Layout of the note: (label, field, kind) entries rendered in order
+    FORMAT_SPEC: FormatSpec = (
+        (_HANDOFF_BANNER, None, SpecKind.TEXT),
 
         # Header
-        note += f"Patient: {self.get_field('patient_name', '[NOT PROVIDED]')}\n"
-        note += f"MRN: {self.get_field('patient_mrn', '[NOT PROVIDED]')}\n"
-        note += f"Location: {self.get_field('patient_location', '[NOT PROVIDED]')}\n"
-        if self.get_field('age'):
-            note += f"Age: {self.get_field('age')}\n"
-        if self.get_field('sex'):
-            note += f"Sex: {self.get_field('sex')}\n"
-        if self.get_field('admission_date'):
-            note += f"Admission Date: {self.get_field('admission_date')}\n"
-        if self.get_field('hospital_day'):
-            note += f"Hospital Day: {self.get_field('hospital_day')}\n"
-        if self.get_field('code_status'):
-            note += f"Code Status: {self.get_field('code_status')}\n"
-        note += f"Handoff Date/Time: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-        if self.get_field('handoff_from'):
-            note += f"From: {self.get_field('handoff_from')}\n"
-        if self.get_field('handoff_to'):
-            note += f"To: {self.get_field('handoff_to')}\n"
-        note += "\n"
-
-        # Primary Diagnosis
-        note += self._format_section("PRIMARY DIAGNOSIS",
-                                     self.get_field('primary_diagnosis', '[NOT PROVIDED]'))
-
-        # Brief History
-        if self.get_field('brief_history'):
-            note += self._format_section("BRIEF HISTORY",
-                                        self.get_field('brief_history'))
-
-        # Past Medical History
-        if self.get_field('past_medical_history'):
-            note += self._format_section("PAST MEDICAL HISTORY",
-                                        self.get_field('past_medical_history'))
-
-        # Allergies
-        if self.get_field('allergies'):
-            note += self._format_section("ALLERGIES", self.get_field('allergies'))
-
-        # Active Issues
-        if isinstance(self.get_field('active_issues'), list):
-            note += self._format_list_section("ACTIVE ISSUES",
-                                             self.get_field('active_issues', ['[NOT PROVIDED]']))
-        else:
-            note += self._format_section("ACTIVE ISSUES",
-                                        self.get_field('active_issues', '[NOT PROVIDED]'))
-
-        # Vital Signs
-        if self.get_field('vital_signs'):
-            note += self._format_section("VITAL SIGNS", self.get_field('vital_signs'))
-
-        # Key Labs
-        if self.get_field('key_labs'):
-            note += self._format_section("KEY LABS", self.get_field('key_labs'))
-
-        # Key Imaging
-        if self.get_field('key_imaging'):
-            note += self._format_section("KEY IMAGING", self.get_field('key_imaging'))
-
-        # Current Medications
-        if self.get_field('current_medications'):
-            if isinstance(self.get_field('current_medications'), list):
-                note += self._format_list_section("CURRENT MEDICATIONS",
-                                                  self.get_field('current_medications'))
-            else:
-                note += self._format_section("CURRENT MEDICATIONS",
-                                            self.get_field('current_medications'))
-
-        # IV Fluids
-        if self.get_field('iv_fluids'):
-            note += self._format_section("IV FLUIDS", self.get_field('iv_fluids'))
-
-        # Diet
-        if self.get_field('diet'):
-            note += self._format_section("DIET", self.get_field('diet'))
-
-        # Activity
-        if self.get_field('activity'):
-            note += self._format_section("ACTIVITY", self.get_field('activity'))
-
-        # Lines, Tubes, Drains
-        if self.get_field('lines_tubes_drains'):
-            if isinstance(self.get_field('lines_tubes_drains'), list):
-                note += self._format_list_section("LINES/TUBES/DRAINS",
-                                                  self.get_field('lines_tubes_drains'))
-            else:
-                note += self._format_section("LINES/TUBES/DRAINS",
-                                            self.get_field('lines_tubes_drains'))
-
-        # Pending Studies
-        if self.get_field('pending_studies'):
-            if isinstance(self.get_field('pending_studies'), list):
-                note += self._format_list_section("PENDING STUDIES",
-                                                  self.get_field('pending_studies'))
-            else:
-                note += self._format_section("PENDING STUDIES",
-                                            self.get_field('pending_studies'))
-
-        # Pending Consults
-        if self.get_field('pending_consults'):
-            if isinstance(self.get_field('pending_consults'), list):
-                note += self._format_list_section("PENDING CONSULTS",
-                                                  self.get_field('pending_consults'))
-            else:
-                note += self._format_section("PENDING CONSULTS",
-                                            self.get_field('pending_consults'))
-
-        # To-Do List
-        if self.get_field('to_do_list'):
-            if isinstance(self.get_field('to_do_list'), list):
-                note += self._format_list_section("TO-DO LIST",
-                                                  self.get_field('to_do_list'))
-            else:
-                note += self._format_section("TO-DO LIST",
-                                            self.get_field('to_do_list'))
-
-        # If-Then Scenarios
-        if self.get_field('if_then_scenarios'):
-            if isinstance(self.get_field('if_then_scenarios'), list):
-                note += self._format_list_section("IF-THEN SCENARIOS",
-                                                  self.get_field('if_then_scenarios'))
-            else:
-                note += self._format_section("IF-THEN SCENARIOS",
-                                            self.get_field('if_then_scenarios'))
+        ("Patient", 'patient_name', SpecKind.LINE),
+        ("MRN", 'patient_mrn', SpecKind.LINE),
+        ("Location", 'patient_location', SpecKind.LINE),
+        ("Age", 'age', SpecKind.OPT_LINE),
+        ("Sex", 'sex', SpecKind.OPT_LINE),
+        ("Admission Date", 'admission_date', SpecKind.OPT_LINE),
+        ("Hospital Day", 'hospital_day', SpecKind.OPT_LINE),
+        ("Code Status", 'code_status', SpecKind.OPT_LINE),
+        ("Handoff Date/Time", None, SpecKind.TIMESTAMP),
+        ("From", 'handoff_from', SpecKind.OPT_LINE),
+        ("To", 'handoff_to', SpecKind.OPT_LINE),
+        ("\n", None, SpecKind.TEXT),
+
+        ("PRIMARY DIAGNOSIS", 'primary_diagnosis', SpecKind.SECTION),
+        ("BRIEF HISTORY", 'brief_history', SpecKind.OPT_SECTION),
+        ("PAST MEDICAL HISTORY", 'past_medical_history', SpecKind.OPT_SECTION),
+        ("ALLERGIES", 'allergies', SpecKind.OPT_SECTION),
+        ("ACTIVE ISSUES", 'active_issues', SpecKind.LIST_SECTION),
+        ("VITAL SIGNS", 'vital_signs', SpecKind.OPT_SECTION),
+        ("KEY LABS", 'key_labs', SpecKind.OPT_SECTION),
+        ("KEY IMAGING", 'key_imaging', SpecKind.OPT_SECTION),
+        ("CURRENT MEDICATIONS", 'current_medications', SpecKind.OPT_LIST_SECTION),
+        ("IV FLUIDS", 'iv_fluids', SpecKind.OPT_SECTION),
+        ("DIET", 'diet', SpecKind.OPT_SECTION),
+        ("ACTIVITY", 'activity', SpecKind.OPT_SECTION),
+        ("LINES/TUBES/DRAINS", 'lines_tubes_drains', SpecKind.OPT_LIST_SECTION),
+        ("PENDING STUDIES", 'pending_studies', SpecKind.OPT_LIST_SECTION),
+        ("PENDING CONSULTS", 'pending_consults', SpecKind.OPT_LIST_SECTION),
+        ("TO-DO LIST", 'to_do_list', SpecKind.OPT_LIST_SECTION),
+        ("IF-THEN SCENARIOS", 'if_then_scenarios', SpecKind.OPT_LIST_SECTION),
 
         # Discharge Planning
-        if self.get_field('anticipated_discharge_date'):
-            note += self._format_section("ANTICIPATED DISCHARGE DATE",
-                                        self.get_field('anticipated_discharge_date'))
+        ("ANTICIPATED DISCHARGE DATE", 'anticipated_discharge_date', SpecKind.OPT_SECTION),
+        ("DISCHARGE PLANNING", 'discharge_planning', SpecKind.OPT_SECTION),
 
-        if self.get_field('discharge_planning'):
-            note += self._format_section("DISCHARGE PLANNING",
-                                        self.get_field('discharge_planning'))
-
-        # Family Communication
-        if self.get_field('family_communication'):
-            note += self._format_section("FAMILY COMMUNICATION",
-                                        self.get_field('family_communication'))
-
-        note += "=" * 80 + "\n"
-        return note
+        ("FAMILY COMMUNICATION", 'family_communication', SpecKind.OPT_SECTION),
+        (_EQ_BAR, None, SpecKind.TEXT)
+    )
 
 
 class OperativeReportTemplate(MedicalNoteTemplate):
@@ -459,166 +519,112 @@ class OperativeReportTemplate(MedicalNoteTemplate):
     Used to document surgical procedures.
     """
 
-    def get_required_fields(self) -> List[str]:
-        return [
-            'patient_name',
-            'patient_mrn',
-            'date_of_surgery',
-            'preoperative_diagnosis',
-            'postoperative_diagnosis',
-            'procedure_performed',
-            'surgeon',
-            'anesthesia_type',
-            'operative_findings',
-            'description_of_procedure',
-            'estimated_blood_loss',
-            'specimens',
-            'complications',
-            'disposition'
-        ]
-
-    def get_optional_fields(self) -> List[str]:
-        return [
-            'patient_dob',
-            'age',
-            'sex',
-            'indication',
-            'assistant_surgeon',
-            'attending_surgeon',
-            'anesthesiologist',
-            'nurses',
-            'start_time',
-            'end_time',
-            'total_time',
-            'ivf_given',
-            'urine_output',
-            'drains',
-            'implants',
-            'counts_correct',
-            'pathology',
-            'condition',
-            'follow_up_plan'
-        ]
-
-    def format_note(self) -> str:
-        """Format the operative report."""
-        note = "=" * 80 + "\n"
-        note += "OPERATIVE REPORT\n"
-        note += "=" * 80 + "\n\n"
+    __slots__ = ()
+
+    REQUIRED_FIELDS: Tuple[str, ...] = (
+        'patient_name',
+        'patient_mrn',
+        'date_of_surgery',
+        'preoperative_diagnosis',
+        'postoperative_diagnosis',
+        'procedure_performed',
+        'surgeon',
+        'anesthesia_type',
+        'operative_findings',
+        'description_of_procedure',
+        'estimated_blood_loss',
+        'specimens',
+        'complications',
+        'disposition'
+    )
+
+    OPTIONAL_FIELDS: Tuple[str, ...] = (
+        'patient_dob',
+        'age',
+        'sex',
+        'indication',
+        'assistant_surgeon',
+        'attending_surgeon',
+        'anesthesiologist',
+        'nurses',
+        'start_time',
+        'end_time',
+        'total_time',
+        'ivf_given',
+        'urine_output',
+        'drains',
+        'implants',
+        'counts_correct',
+        'pathology',
+        'condition',
+        'follow_up_plan'
+    )
+
+    # Layout of the note: (label, field, kind) entries rendered in order
+    FORMAT_SPEC: FormatSpec = (
+        (_OPERATIVE_BANNER, None, SpecKind.TEXT),
 
         # Patient Information
-        note += "PATIENT INFORMATION:\n"
-        note += f"Name: {self.get_field('patient_name', '[NOT PROVIDED]')}\n"
-        note += f"MRN: {self.get_field('patient_mrn', '[NOT PROVIDED]')}\n"
-        if self.get_field('patient_dob'):
-            note += f"DOB: {self.get_field('patient_dob')}\n"
-        if self.get_field('age'):
-            note += f"Age: {self.get_field('age')}\n"
-        if self.get_field('sex'):
-            note += f"Sex: {self.get_field('sex')}\n"
-        note += f"Date of Surgery: {self.get_field('date_of_surgery', '[NOT PROVIDED]')}\n"
-        if self.get_field('start_time'):
-            note += f"Start Time: {self.get_field('start_time')}\n"
-        if self.get_field('end_time'):
-            note += f"End Time: {self.get_field('end_time')}\n"
-        if self.get_field('total_time'):
-            note += f"Total Time: {self.get_field('total_time')}\n"
-        note += "\n"
+        ("PATIENT INFORMATION:\n", None, SpecKind.TEXT),
+        ("Name", 'patient_name', SpecKind.LINE),
+        ("MRN", 'patient_mrn', SpecKind.LINE),
+        ("DOB", 'patient_dob', SpecKind.OPT_LINE),
+        ("Age", 'age', SpecKind.OPT_LINE),
+        ("Sex", 'sex', SpecKind.OPT_LINE),
+        ("Date of Surgery", 'date_of_surgery', SpecKind.LINE),
+        ("Start Time", 'start_time', SpecKind.OPT_LINE),
+        ("End Time", 'end_time', SpecKind.OPT_LINE),
+        ("Total Time", 'total_time', SpecKind.OPT_LINE),
+        ("\n", None, SpecKind.TEXT),
 
         # Surgical Team
-        note += "SURGICAL TEAM:\n"
-        note += f"Surgeon: {self.get_field('surgeon', '[NOT PROVIDED]')}\n"
-        if self.get_field('assistant_surgeon'):
-            note += f"Assistant Surgeon: {self.get_field('assistant_surgeon')}\n"
-        if self.get_field('attending_surgeon'):
-            note += f"Attending Surgeon: {self.get_field('attending_surgeon')}\n"
-        if self.get_field('anesthesiologist'):
-            note += f"Anesthesiologist: {self.get_field('anesthesiologist')}\n"
-        note += f"Anesthesia Type: {self.get_field('anesthesia_type', '[NOT PROVIDED]')}\n"
-        if self.get_field('nurses'):
-            note += f"Nursing Staff: {self.get_field('nurses')}\n"
-        note += "\n"
-
-        # Diagnoses
-        note += self._format_section("PREOPERATIVE DIAGNOSIS",
-                                     self.get_field('preoperative_diagnosis', '[NOT PROVIDED]'))
-
-        note += self._format_section("POSTOPERATIVE DIAGNOSIS",
-                                     self.get_field('postoperative_diagnosis', '[NOT PROVIDED]'))
-
-        # Procedure
-        if isinstance(self.get_field('procedure_performed'), list):
-            note += self._format_list_section("PROCEDURE(S) PERFORMED",
-                                             self.get_field('procedure_performed', ['[NOT PROVIDED]']))
-        else:
-            note += self._format_section("PROCEDURE(S) PERFORMED",
-                                        self.get_field('procedure_performed', '[NOT PROVIDED]'))
-
-        # Indication
-        if self.get_field('indication'):
-            note += self._format_section("INDICATION", self.get_field('indication'))
-
-        # Operative Findings
-        note += self._format_section("OPERATIVE FINDINGS",
-                                     self.get_field('operative_findings', '[NOT PROVIDED]'))
-
-        # Description of Procedure
-        note += self._format_section("DESCRIPTION OF PROCEDURE",
-                                     self.get_field('description_of_procedure', '[NOT PROVIDED]'))
+        ("SURGICAL TEAM:\n", None, SpecKind.TEXT),
+        ("Surgeon", 'surgeon', SpecKind.LINE),
+        ("Assistant Surgeon", 'assistant_surgeon', SpecKind.OPT_LINE),
+        ("Attending Surgeon", 'attending_surgeon', SpecKind.OPT_LINE),
+        ("Anesthesiologist", 'anesthesiologist', SpecKind.OPT_LINE),
+        ("Anesthesia Type", 'anesthesia_type', SpecKind.LINE),
+        ("Nursing Staff", 'nurses', SpecKind.OPT_LINE),
+        ("\n", None, SpecKind.TEXT),
+
+        ("PREOPERATIVE DIAGNOSIS", 'preoperative_diagnosis', SpecKind.SECTION),
+        ("POSTOPERATIVE DIAGNOSIS", 'postoperative_diagnosis', SpecKind.SECTION),
+        ("PROCEDURE(S) PERFORMED", 'procedure_performed', SpecKind.LIST_SECTION),
+        ("INDICATION", 'indication', SpecKind.OPT_SECTION),
+        ("OPERATIVE FINDINGS", 'operative_findings', SpecKind.SECTION),
+        ("DESCRIPTION OF PROCEDURE", 'description_of_procedure', SpecKind.SECTION),
 
         # Intraoperative Details
-        note += "INTRAOPERATIVE DETAILS:\n"
-        note += f"Estimated Blood Loss: {self.get_field('estimated_blood_loss', '[NOT PROVIDED]')}\n"
-        if self.get_field('ivf_given'):
-            note += f"IV Fluids Given: {self.get_field('ivf_given')}\n"
-        if self.get_field('urine_output'):
-            note += f"Urine Output: {self.get_field('urine_output')}\n"
-        note += "\n"
-
-        # Specimens
-        note += self._format_section("SPECIMENS",
-                                     self.get_field('specimens', '[NOT PROVIDED]'))
-
-        # Pathology
-        if self.get_field('pathology'):
-            note += self._format_section("PATHOLOGY", self.get_field('pathology'))
-
-        # Drains/Implants
-        if self.get_field('drains'):
-            note += self._format_section("DRAINS", self.get_field('drains'))
-
-        if self.get_field('implants'):
-            note += self._format_section("IMPLANTS", self.get_field('implants'))
-
-        # Counts
-        if self.get_field('counts_correct'):
-            note += self._format_section("COUNTS", self.get_field('counts_correct'))
-
-        # Complications
-        note += self._format_section("COMPLICATIONS",
-                                     self.get_field('complications', '[NOT PROVIDED]'))
-
-        # Disposition
-        note += self._format_section("DISPOSITION",
-                                     self.get_field('disposition', '[NOT PROVIDED]'))
-
-        # Condition
-        if self.get_field('condition'):
-            note += self._format_section("CONDITION", self.get_field('condition'))
-
-        # Follow-up
-        if self.get_field('follow_up_plan'):
-            note += self._format_section("FOLLOW-UP PLAN",
-                                        self.get_field('follow_up_plan'))
+        ("INTRAOPERATIVE DETAILS:\n", None, SpecKind.TEXT),
+        ("Estimated Blood Loss", 'estimated_blood_loss', SpecKind.LINE),
+        ("IV Fluids Given", 'ivf_given', SpecKind.OPT_LINE),
+        ("Urine Output", 'urine_output', SpecKind.OPT_LINE),
+        ("\n", None, SpecKind.TEXT),
+
+        ("SPECIMENS", 'specimens', SpecKind.SECTION),
+        ("PATHOLOGY", 'pathology', SpecKind.OPT_SECTION),
+        ("DRAINS", 'drains', SpecKind.OPT_SECTION),
+        ("IMPLANTS", 'implants', SpecKind.OPT_SECTION),
+        ("COUNTS", 'counts_correct', SpecKind.OPT_SECTION),
+        ("COMPLICATIONS", 'complications', SpecKind.SECTION),
+        ("DISPOSITION", 'disposition', SpecKind.SECTION),
+        ("CONDITION", 'condition', SpecKind.OPT_SECTION),
+        ("FOLLOW-UP PLAN", 'follow_up_plan', SpecKind.OPT_SECTION),
 
         # Signature
-        note += "\n" + "-" * 80 + "\n"
-        note += f"Surgeon: {self.get_field('surgeon', '[NOT PROVIDED]')}\n"
-        if self.get_field('attending_surgeon'):
-            note += f"Attending: {self.get_field('attending_surgeon')}\n"
-        note += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+        ("\n" + _DASH_BAR, None, SpecKind.TEXT),
+        ("Surgeon", 'surgeon', SpecKind.LINE),
+        ("Attending", 'attending_surgeon', SpecKind.OPT_LINE),
+        ("Date", None, SpecKind.TIMESTAMP)
+    )
 
-        return note
+
+# Template classes available through create_template, by type name
+_TEMPLATE_REGISTRY: Dict[str, type] = {
+    'consult': ConsultNoteTemplate,
+    'handoff': EpicHandoffTemplate,
+    'operative': OperativeReportTemplate
+}
 
 
 # Factory function for easy template creation
@@ -635,15 +641,10 @@ def create_template(template_type: str) -> MedicalNoteTemplate:
     Raises:
         ValueError: If template_type is not recognized
     """
-    templates = {
-        'consult': ConsultNoteTemplate,
-        'handoff': EpicHandoffTemplate,
-        'operative': OperativeReportTemplate
-    }
-
     template_type = template_type.lower()
-    if template_type not in templates:
+    template_class = _TEMPLATE_REGISTRY.get(template_type)
+    if template_class is None:
         raise ValueError(f"Unknown template type: {template_type}. "
-                        f"Valid types are: {', '.join(templates.keys())}")
+                        f"Valid types are: {', '.join(_TEMPLATE_REGISTRY.keys())}")
 
-    return templates[template_type]()
+    return template_class()
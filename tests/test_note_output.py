@@ -0,0 +1,100 @@
+"""
+Golden-output tests for the formatted notes.
+The built-in templates render their notes from FORMAT_SPEC layouts compiled
+into generated code; these tests pin the exact text so that changes to a spec
+or to the code generator cannot silently alter a note.
+Regenerate a golden file only when a layout change is intended.
+"""
+
+import io
+import re
+from pathlib import Path
+
+import pytest
+
+from medical_note_template import (
+    ConsultNoteTemplate,
+    EpicHandoffTemplate,
+    MedicalNoteTemplate,
+    OperativeReportTemplate,
+    SpecKind
+)
+
+GOLDEN_DIR = Path(__file__).parent / 'golden'
+
+TEMPLATES = {
+    'consult': ConsultNoteTemplate,
+    'handoff': EpicHandoffTemplate,
+    'operative': OperativeReportTemplate,
+}
+
+# The date/time printed in a note's Date: / Handoff Date/Time: line
+_STAMP = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}')
+
+
+def mask_timestamp(note):
+    """Replace the printed date/time so notes can be compared across runs."""
+    return _STAMP.sub('YYYY-MM-DD HH:MM', note)
+
+
+def filled_values(template):
+    """Return a value for every field, with every other one given as a list."""
+    names = template.get_required_fields() + template.get_optional_fields()
+    return {
+        name: [f"{name} first", f"{name} second"] if i % 2 else f"{name} text"
+        for i, name in enumerate(names)
+    }
+
+
+@pytest.mark.parametrize('kind', sorted(TEMPLATES))
+@pytest.mark.parametrize('state', ['filled', 'empty'])
+def test_note_matches_golden(kind, state):
+    template = TEMPLATES[kind]()
+    if state == 'filled':
+        template.set_multiple_fields(filled_values(template))
+
+    expected = (GOLDEN_DIR / f"{kind}_{state}.txt").read_text()
+    assert mask_timestamp(template.format_note()) == expected
+
+    fp = io.StringIO()
+    template.write_to(fp)
+    assert mask_timestamp(fp.getvalue()) == expected
+
+
+class QuotedLabelTemplate(MedicalNoteTemplate):
+    """A layout whose labels contain braces and quotes, which the code generator must escape."""
+    REQUIRED_FIELDS = ('value',)
+    OPTIONAL_FIELDS = ('extra',)
+    FORMAT_SPEC = (
+        ("{literal} 'single' \"double\"\n", None, SpecKind.TEXT),
+        ("Set {value}", 'value', SpecKind.LINE),
+        ("It's \"{extra}\"", 'extra', SpecKind.OPT_LINE),
+        ('Section {value} "quoted"', 'value', SpecKind.SECTION),
+        ("Stamp {now}", None, SpecKind.TIMESTAMP),
+    )
+
+
+def test_labels_with_braces_and_quotes():
+    template = QuotedLabelTemplate()
+    template.set_multiple_fields({'value': '{self} "v"', 'extra': "x'y"})
+
+    assert mask_timestamp(template.format_note()) == (
+        "{literal} 'single' \"double\"\n"
+        "Set {value}: {self} \"v\"\n"
+        "It's \"{extra}\": x'y\n"
+        "Section {value} \"quoted\":\n"
+        "{self} \"v\"\n"
+        "\n"
+        "Stamp {now}: YYYY-MM-DD HH:MM\n"
+    )
+
+
+def test_labels_with_braces_and_quotes_when_empty():
+    assert mask_timestamp(QuotedLabelTemplate().format_note()) == (
+        "{literal} 'single' \"double\"\n"
+        "Set {value}: [NOT PROVIDED]\n"
+        "Section {value} \"quoted\":\n"
+        "[NOT PROVIDED]\n"
+        "\n"
+        "Stamp {now}: YYYY-MM-DD HH:MM\n"
+    )